@@ -4,133 +4,441 @@ YouTube Video Downloader Flask Backend
 Created with Comet Assistant
 
 This Flask application provides a REST API for downloading YouTube videos using yt-dlp.
-It accepts POST requests to /download with a YouTube URL and processes the download.
+It accepts POST requests to /download with a YouTube URL, queues the download on a
+background worker pool and reports progress through /status/<job_id>.
 """
 
 import os
+import copy
 import json
+import time
 import uuid
+import secrets
+import shutil
 import logging
+import functools
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 
-from flask import Flask, request, jsonify, send_file, render_template_string
+from flask import (
+    Flask, Response, request, jsonify, send_file, render_template_string,
+    url_for, make_response, stream_with_context,
+)
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+from werkzeug.wsgi import FileWrapper
+import orjson
 import yt_dlp
 
+try:
+    # RE2 matches in linear time with no backtracking; optional
+    import re2 as re
+except ImportError:
+    import re
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by every jsonify call."""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend integration
+Compress(app)  # gzip/br for JSON and HTML responses; file downloads are left alone
 
 # Configuration
 CONFIG = {
     'DOWNLOAD_DIR': os.path.join(tempfile.gettempdir(), 'yt_downloads'),
     'MAX_FILE_SIZE': 500 * 1024 * 1024,  # 500MB limit
     'ALLOWED_FORMATS': ['mp4', 'webm', 'mkv'],
-    'DEFAULT_QUALITY': 'best[height<=720]',  # Default to 720p max
+    'INFO_CACHE_SIZE': 256,  # Number of URLs whose metadata is kept
+    'INFO_CACHE_TTL': 300,  # Seconds; format URLs in the metadata expire
+    'MAX_CONCURRENT_DOWNLOADS': int(os.environ.get('MAX_CONCURRENT_DOWNLOADS', 4)),
+    'SEND_FILE_BUFFER_SIZE': 256 * 1024,  # Bytes per chunk when streaming files
+    'CONCURRENT_FRAGMENTS': 8,  # Parallel HLS/DASH fragment fetches per download
+    'HTTP_CHUNK_SIZE': 10 * 1024 * 1024,  # Range request size for HTTP downloads
+    'FILE_TTL': 30 * 60,  # Seconds before downloaded files and finished jobs are removed
+    'REAP_INTERVAL': 60,  # Seconds between download directory sweeps
+    'MAX_BATCH_SIZE': 50,  # URLs accepted per /download_batch request
+    # Behind nginx, hand file transfers off via X-Accel-Redirect (see README)
+    'USE_XACCEL': os.environ.get('USE_XACCEL', '').lower() in ('1', 'true', 'yes'),
+    'XACCEL_PREFIX': os.environ.get('XACCEL_PREFIX', '/protected/'),
+    'PROGRESS_INTERVAL': 0.5,  # Minimum seconds between recorded progress updates
+    'SSE_KEEPALIVE': 15,  # Seconds between keep-alive comments on /progress streams
+    # Each /progress stream holds a server thread; keep this below the
+    # gunicorn thread count so /status and /files still get served
+    'MAX_PROGRESS_STREAMS': int(os.environ.get('MAX_PROGRESS_STREAMS', 16)),
+    # Persistent yt-dlp cache (deciphered YouTube signature functions)
+    'CACHE_DIR': os.environ.get(
+        'YTDLP_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'yt-dlp-wrapper'),
+    ),
+    # Optional Netscape cookie jar. Read-only: the long-lived YoutubeDL
+    # instances are never closed, so yt-dlp never writes cookie updates back.
+    'COOKIE_FILE': os.environ.get('YTDLP_COOKIE_FILE'),
+    'PREWARM_CACHE': os.environ.get('YTDLP_PREWARM', '').lower() in ('1', 'true', 'yes'),
 }
 
-# Ensure download directory exists
+# Default to 720p max. The size filters let yt-dlp's format selector skip
+# streams over MAX_FILE_SIZE up front; the last alternative covers formats
+# without size metadata and is still checked in download_video.
+CONFIG['DEFAULT_QUALITY'] = (
+    f"best[height<=720][filesize<{CONFIG['MAX_FILE_SIZE']}]"
+    f"/best[height<=720][filesize_approx<{CONFIG['MAX_FILE_SIZE']}]"
+    "/best[height<=720]"
+)
+
+# Use aria2c for DASH when installed (multiple connections per file);
+# otherwise yt-dlp's native downloader is used
+ARIA2C_PATH = shutil.which('aria2c')
+
+# Per-thread YoutubeDL instances, see _thread_ydl
+_YDL_LOCAL = threading.local()
+
+def _dispatch_progress(d):
+    """yt-dlp progress hook forwarding to the calling thread's current download."""
+    progress_hook = getattr(_YDL_LOCAL, 'progress_hook', None)
+    if progress_hook is not None:
+        progress_hook(d)
+
+_INFO_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'format': CONFIG['DEFAULT_QUALITY'],  # Same selection as downloads
+    'noplaylist': True,
+    'cachedir': CONFIG['CACHE_DIR'],
+}
+
+_DOWNLOAD_YDL_OPTS = {
+    'format': CONFIG['DEFAULT_QUALITY'],
+    'restrictfilenames': True,  # Avoid special characters in filenames
+    'noplaylist': True,  # Only download single video, not playlist
+    'extractaudio': False,
+    'writeinfojson': False,
+    'writethumbnail': False,
+    'updatetime': False,  # Keep mtime as download time; the reaper relies on it
+    'concurrent_fragment_downloads': CONFIG['CONCURRENT_FRAGMENTS'],
+    'http_chunk_size': CONFIG['HTTP_CHUNK_SIZE'],
+    'retries': 3,
+    'fragment_retries': 3,
+    'buffersize': 1024 * 1024,
+    'progress_hooks': [_dispatch_progress],
+    'cachedir': CONFIG['CACHE_DIR'],
+}
+
+if CONFIG['COOKIE_FILE']:
+    _INFO_YDL_OPTS['cookiefile'] = CONFIG['COOKIE_FILE']
+    _DOWNLOAD_YDL_OPTS['cookiefile'] = CONFIG['COOKIE_FILE']
+
+if ARIA2C_PATH:
+    _DOWNLOAD_YDL_OPTS['external_downloader'] = {'dash': 'aria2c'}
+    _DOWNLOAD_YDL_OPTS['external_downloader_args'] = {'aria2c': ['-x', '16', '-k', '1M']}
+
+# Ensure download and cache directories exist
 os.makedirs(CONFIG['DOWNLOAD_DIR'], exist_ok=True)
+try:
+    os.makedirs(CONFIG['CACHE_DIR'], exist_ok=True)
+except OSError as e:
+    # The cache is optional; run without it rather than fail to start
+    logger.warning(f"yt-dlp cache disabled, cannot create {CONFIG['CACHE_DIR']}: {str(e)}")
+    CONFIG['CACHE_DIR'] = None
+    _INFO_YDL_OPTS['cachedir'] = False
+    _DOWNLOAD_YDL_OPTS['cachedir'] = False
+# Resolved once for the serve_file containment check
+_ABS_DOWNLOAD_DIR = os.path.realpath(CONFIG['DOWNLOAD_DIR'])
+# Output template prefix; download_video appends '<id>_%(title)s.%(ext)s'
+_OUTTMPL_PREFIX = os.path.join(CONFIG['DOWNLOAD_DIR'], '')
+
+# Background download jobs, keyed by job id. Downloads run on the executor so
+# request threads return immediately; clients poll /status/<job_id>.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=CONFIG['MAX_CONCURRENT_DOWNLOADS'],
+    thread_name_prefix='download',
+)
+_JOBS = {}
+_JOBS_LOCK = threading.Lock()
+# Notified on every job update; /progress streams wait on it
+_JOBS_CHANGED = threading.Condition(_JOBS_LOCK)
+# URL -> id of the queued/running job downloading it, so identical requests
+# share one download (guarded by _JOBS_LOCK)
+_INFLIGHT = {}
+
+# Open /progress streams; beyond the limit clients are told to poll /status
+_PROGRESS_STREAMS = threading.BoundedSemaphore(CONFIG['MAX_PROGRESS_STREAMS'])
+
+# Held by serve_file while opening a file and by the reaper while deleting one.
+# Once a file is open, unlinking it does not interrupt the transfer.
+_FILES_LOCK = threading.Lock()
 
 # YouTube URL validation regex (same as frontend)
-YOUTUBE_REGEX_PATTERNS = [
-    r'^https?://(www\.)?(youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})',
-    r'^https?://(www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-    r'^https?://(www\.)?youtube\.com/v/([a-zA-Z0-9_-]{11})',
-    r'^https?://(www\.)?youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)'
-]
+# A single anchored pattern with a shared scheme/host prefix; each video id is
+# followed by an explicit terminator so a failed match aborts in linear time.
+_YT_RE = re.compile(
+    r'^https?://(?:www\.)?(?:'
+    r'youtube\.com/(?:watch\?v=|embed/|v/)([A-Za-z0-9_-]{11})(?:[?&#/]|$)'
+    r'|youtu\.be/([A-Za-z0-9_-]{11})(?:[?&#/]|$)'
+    r'|youtube\.com/playlist\?list=([A-Za-z0-9_-]+)'
+    r')'
+)
+MAX_URL_LENGTH = 2048
 
 def is_valid_youtube_url(url):
     """Validate if the URL is a valid YouTube URL."""
-    import re
     if not url or not isinstance(url, str):
         return False
     
-    return any(re.match(pattern, url.strip()) for pattern in YOUTUBE_REGEX_PATTERNS)
+    if len(url) > MAX_URL_LENGTH:
+        return False
+    
+    return bool(_YT_RE.match(url.strip()))
 
-def get_video_info(url):
-    """Extract basic video information without downloading."""
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-    }
+def _thread_ydl(name, ydl_opts):
+    """Return this thread's long-lived YoutubeDL instance for ``name``.
     
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        try:
-            info = ydl.extract_info(url, download=False)
-            return {
-                'title': info.get('title', 'Unknown'),
-                'duration': info.get('duration', 0),
-                'uploader': info.get('uploader', 'Unknown'),
-                'view_count': info.get('view_count', 0),
-            }
-        except Exception as e:
-            logger.error(f"Error extracting video info: {str(e)}")
-            return None
+    Building a YoutubeDL loads every extractor class, the cookie jar and the
+    postprocessor chain, so instances are reused across requests. They are not
+    thread-safe, hence one per worker thread.
+    """
+    ydl = getattr(_YDL_LOCAL, name, None)
+    if ydl is None:
+        # YoutubeDL keeps (and mutates) the dict it is given, so each instance
+        # needs its own copy for per-download options like outtmpl
+        ydl = yt_dlp.YoutubeDL(copy.deepcopy(ydl_opts))
+        setattr(_YDL_LOCAL, name, ydl)
+    return ydl
+
+@functools.lru_cache(maxsize=CONFIG['INFO_CACHE_SIZE'])
+def _cached_extract_info(url, ttl_bucket):
+    """Fetch video metadata; ``ttl_bucket`` ages entries out of the cache."""
+    return _thread_ydl('info', _INFO_YDL_OPTS).extract_info(url, download=False)
+
+def _extract_info(url):
+    """Return the raw yt-dlp info dict for a URL, cached for up to INFO_CACHE_TTL seconds."""
+    # Entries from an older time bucket are never hit again and fall out of the LRU
+    ttl_bucket = int(time.monotonic() // CONFIG['INFO_CACHE_TTL'])
+    return _cached_extract_info(url, ttl_bucket)
+
+def get_video_info(info):
+    """Extract basic video information from a yt-dlp info dict."""
+    return {
+        'title': info.get('title', 'Unknown'),
+        'duration': info.get('duration', 0),
+        'uploader': info.get('uploader', 'Unknown'),
+        'view_count': info.get('view_count', 0),
+    }
 
-def download_video(url, output_path):
-    """Download video using yt-dlp."""
+def download_video(url, info=None, progress_hook=None):
+    """Download video into DOWNLOAD_DIR using yt-dlp.
+    
+    If ``info`` (as returned by ``_extract_info``) is given, it is reused
+    instead of fetching the video metadata again. ``progress_hook`` receives
+    yt-dlp's progress dicts while the download runs.
+    """
     # Generate unique filename
-    download_id = str(uuid.uuid4())[:8]
+    download_id = secrets.token_hex(4)
     
-    ydl_opts = {
-        'format': CONFIG['DEFAULT_QUALITY'],
-        'outtmpl': os.path.join(output_path, f'{download_id}_%(title)s.%(ext)s'),
-        'restrictfilenames': True,  # Avoid special characters in filenames
-        'noplaylist': True,  # Only download single video, not playlist
-        'extractaudio': False,
-        'writeinfojson': False,
-        'writethumbnail': False,
-    }
+    ydl = _thread_ydl('download', _DOWNLOAD_YDL_OPTS)
+    # The output template is the only per-download option
+    ydl.params['outtmpl']['default'] = f'{_OUTTMPL_PREFIX}{download_id}_%(title)s.%(ext)s'
+    _YDL_LOCAL.progress_hook = progress_hook
     
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    try:
+        # Extract info first to get the final filename
+        if info is None:
+            info = _extract_info(url)
+        
+        # Check file size estimate
+        filesize = info.get('filesize') or info.get('filesize_approx') or 0
+        if filesize > CONFIG['MAX_FILE_SIZE']:
+            raise ValueError(f"File too large: {filesize / (1024*1024):.1f}MB > {CONFIG['MAX_FILE_SIZE'] / (1024*1024):.1f}MB")
+        
+        # Download the video from the already extracted info
+        info = ydl.process_ie_result(copy.deepcopy(info), download=True)
+        
+        # Find the downloaded file. yt-dlp records the final path (after any
+        # remuxing); prepare_filename is the deterministic fallback.
         try:
-            # Extract info first to get the final filename
-            info = ydl.extract_info(url, download=False)
-            
-            # Check file size estimate
-            filesize = info.get('filesize') or info.get('filesize_approx', 0)
-            if filesize > CONFIG['MAX_FILE_SIZE']:
-                raise ValueError(f"File too large: {filesize / (1024*1024):.1f}MB > {CONFIG['MAX_FILE_SIZE'] / (1024*1024):.1f}MB")
-            
-            # Download the video
-            ydl.download([url])
-            
-            # Find the downloaded file
-            expected_filename = ydl.prepare_filename(info)
-            
-            # The actual filename might be different due to restrictfilenames
-            download_dir = Path(output_path)
-            downloaded_files = list(download_dir.glob(f'{download_id}_*'))
-            
-            if downloaded_files:
-                downloaded_file = downloaded_files[0]
-                return {
-                    'success': True,
-                    'filename': downloaded_file.name,
-                    'filepath': str(downloaded_file),
-                    'title': info.get('title', 'Unknown'),
-                    'size': downloaded_file.stat().st_size if downloaded_file.exists() else 0
-                }
-            else:
+            downloaded_file = Path(info['requested_downloads'][0]['filepath'])
+        except (KeyError, IndexError):
+            downloaded_file = Path(ydl.prepare_filename(info))
+        
+        if not downloaded_file.exists():
+            # Last resort: scan the download directory for this download id
+            downloaded_files = list(Path(CONFIG['DOWNLOAD_DIR']).glob(f'{download_id}_*'))
+            if not downloaded_files:
                 raise FileNotFoundError("Downloaded file not found")
-                
+            downloaded_file = downloaded_files[0]
+        
+        return {
+            'success': True,
+            'filename': downloaded_file.name,
+            'filepath': str(downloaded_file),
+            'title': info.get('title', 'Unknown'),
+            'size': downloaded_file.stat().st_size,
+        }
+            
+    except Exception as e:
+        logger.error(f"Download error: {str(e)}")
+        raise
+    
+    finally:
+        _YDL_LOCAL.progress_hook = None
+
+def _update_job(job_id, **fields):
+    """Update a job record under the jobs lock and wake progress streams."""
+    with _JOBS_CHANGED:
+        _JOBS[job_id].update(fields)
+        _JOBS_CHANGED.notify_all()
+
+def _job_progress_hook(job_id):
+    """Build a yt-dlp progress hook that records a job's progress."""
+    last_update = 0
+    
+    def hook(d):
+        nonlocal last_update
+        now = time.monotonic()
+        # yt-dlp reports every block; record at most every PROGRESS_INTERVAL
+        if d['status'] == 'downloading' and now - last_update < CONFIG['PROGRESS_INTERVAL']:
+            return
+        last_update = now
+        _update_job(job_id, progress={
+            'status': d['status'],
+            'downloaded_bytes': d.get('downloaded_bytes'),
+            'total_bytes': d.get('total_bytes') or d.get('total_bytes_estimate'),
+            'speed': d.get('speed'),
+            'eta': d.get('eta'),
+        })
+    
+    return hook
+
+def _run_download_job(job_id, url):
+    """Executor entry point: run a download and record its outcome."""
+    # Metadata extraction is network-bound too, so it happens here rather
+    # than on the request thread
+    try:
+        info = _extract_info(url)
+    except Exception as e:
+        logger.error(f"Error extracting video info: {str(e)}")
+        _update_job(job_id, status='failed', completed=time.time(), error='Could not extract video information')
+        return
+    
+    _update_job(job_id, status='started', video_info=get_video_info(info))
+    
+    try:
+        download_result = download_video(
+            url, info=info, progress_hook=_job_progress_hook(job_id),
+        )
+    except ValueError as e:
+        _update_job(job_id, status='failed', completed=time.time(), error=str(e))
+    except Exception as e:
+        logger.error(f"Download failed: {str(e)}")
+        _update_job(job_id, status='failed', completed=time.time(), error=f'Download failed: {str(e)}')
+    else:
+        logger.info(f"Successfully downloaded: {download_result['filename']}")
+        _update_job(job_id, status='finished', completed=time.time(), result=download_result)
+
+def _forget_inflight(url, job_id):
+    """Drop a finished job from the in-flight map, unless it was replaced."""
+    with _JOBS_LOCK:
+        if _INFLIGHT.get(url) == job_id:
+            del _INFLIGHT[url]
+
+def _enqueue_download(url):
+    """Submit a download job for a URL and return ``(job_id, status)``.
+    
+    If the URL is already being downloaded, the existing job is returned
+    instead of starting a second download.
+    """
+    with _JOBS_LOCK:
+        job_id = _INFLIGHT.get(url)
+        if job_id is not None:
+            return job_id, _JOBS[job_id]['status']
+        
+        job_id = uuid.uuid4().hex
+        _JOBS[job_id] = {
+            'status': 'queued',
+            'url': url,
+            'created': time.time(),
+            'video_info': None,
+            'progress': None,
+            'result': None,
+            'error': None,
+            'completed': None,  # Set when the job finishes or fails
+        }
+        _INFLIGHT[url] = job_id
+    
+    future = _EXECUTOR.submit(_run_download_job, job_id, url)
+    future.add_done_callback(lambda f: _forget_inflight(url, job_id))
+    return job_id, 'queued'
+
+def _reap_downloads():
+    """Delete downloads older than FILE_TTL and jobs that completed before then."""
+    cutoff = time.time() - CONFIG['FILE_TTL']
+    
+    with os.scandir(CONFIG['DOWNLOAD_DIR']) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_file() or entry.stat().st_mtime > cutoff:
+                    continue
+                with _FILES_LOCK:
+                    os.unlink(entry.path)
+                logger.info(f"Removed expired download: {entry.name}")
+            except OSError as e:
+                logger.warning(f"Could not remove {entry.name}: {str(e)}")
+    
+    with _JOBS_LOCK:
+        expired = [
+            job_id for job_id, job in _JOBS.items()
+            if job['completed'] is not None and job['completed'] < cutoff
+        ]
+        for job_id in expired:
+            del _JOBS[job_id]
+
+def _reaper():
+    """Background loop that keeps the download directory bounded."""
+    while True:
+        time.sleep(CONFIG['REAP_INTERVAL'])
+        try:
+            _reap_downloads()
         except Exception as e:
-            logger.error(f"Download error: {str(e)}")
-            raise
+            logger.error(f"Download reaper error: {str(e)}")
 
-@app.route('/')
-def index():
-    """Serve the frontend HTML."""
-    # This is a simple way to serve the frontend files
-    # In production, you'd typically use a web server like nginx
-    frontend_html = """
+threading.Thread(target=_reaper, name='download-reaper', daemon=True).start()
+
+def _prewarm_cache():
+    """Extract one video so yt-dlp's signature cache is filled before the first request."""
+    try:
+        _thread_ydl('info', _INFO_YDL_OPTS).extract_info(
+            'https://www.youtube.com/watch?v=dQw4w9WgXcQ', download=False, process=False
+        )
+        logger.info("yt-dlp cache prewarmed")
+    except Exception as e:
+        logger.warning(f"yt-dlp cache prewarm failed: {str(e)}")
+
+if CONFIG['PREWARM_CACHE'] and CONFIG['CACHE_DIR']:
+    threading.Thread(target=_prewarm_cache, name='ytdlp-prewarm', daemon=True).start()
+
+# Static API landing page, built once at import
+_INDEX_HTML = b"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -146,7 +454,11 @@ def index():
             <h1>YouTube Downloader API</h1>
             <div class="info">
                 <h3>API Endpoints:</h3>
-                <p><strong>POST /download</strong> - Download a YouTube video</p>
+                <p><strong>POST /download</strong> - Queue a YouTube video download</p>
+                <p><strong>POST /download_batch</strong> - Queue several downloads at once</p>
+                <p><strong>GET /status/&lt;job_id&gt;</strong> - Check a download job</p>
+                <p><strong>GET /progress/&lt;job_id&gt;</strong> - Stream job progress (Server-Sent Events)</p>
+                <p><strong>GET /files/&lt;filename&gt;</strong> - Fetch a downloaded file</p>
                 <p><strong>GET /health</strong> - Check API health</p>
                 <br>
                 <p>Frontend files should be served separately.</p>
@@ -156,16 +468,25 @@ def index():
     </body>
     </html>
     """
-    return frontend_html
+
+@app.route('/')
+def index():
+    """Serve the frontend HTML."""
+    # This is a simple way to serve the frontend files
+    # In production, you'd typically use a web server like nginx.
+    # Responses are one-shot, so wrap the prebuilt bytes in a fresh one.
+    return app.response_class(_INDEX_HTML, mimetype='text/html')
+
+_HEALTH_STATUS = {
+    'status': 'healthy',
+    'version': '1.0.0'
+}
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0'
-    })
+    # orjson serializes datetime natively, no isoformat() needed
+    return jsonify({**_HEALTH_STATUS, 'timestamp': datetime.now()})
 
 @app.route('/download', methods=['POST'])
 def download_youtube_video():
@@ -196,49 +517,87 @@ def download_youtube_video():
         
         logger.info(f"Processing download request for: {url}")
         
-        # Get video info first
-        video_info = get_video_info(url)
-        if not video_info:
+        # Queue the download and let the client poll for the result
+        job_id, status = _enqueue_download(url)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Download queued',
+            'job_id': job_id,
+            'status': status,
+            'status_url': url_for('job_status', job_id=job_id),
+            'progress_url': url_for('job_progress', job_id=job_id),
+        }), 202
+    
+    except Exception as e:
+        logger.error(f"Request processing failed: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@app.route('/download_batch', methods=['POST'])
+def download_youtube_videos():
+    """Handle requests to download several videos at once."""
+    try:
+        # Validate request
+        if not request.is_json:
             return jsonify({
                 'success': False,
-                'error': 'Could not extract video information'
+                'error': 'Request must be JSON'
             }), 400
         
-        # Download the video
-        try:
-            download_result = download_video(url, CONFIG['DOWNLOAD_DIR'])
-            
-            if download_result['success']:
-                # For this example, we'll return success without actual file serving
-                # In production, you might want to:
-                # 1. Store files temporarily and provide download links
-                # 2. Stream files directly
-                # 3. Use cloud storage
-                
-                response_data = {
-                    'success': True,
-                    'message': 'Video downloaded successfully',
-                    'video_info': video_info,
-                    'filename': download_result['filename'],
-                    'size': download_result['size'],
-                    # 'download_url': f'/files/{download_result["filename"]}',  # For file serving
-                }
-                
-                logger.info(f"Successfully downloaded: {download_result['filename']}")
-                return jsonify(response_data)
-            
-        except ValueError as e:
+        data = request.get_json()
+        urls = data.get('urls')
+        
+        if not isinstance(urls, list) or not urls:
             return jsonify({
                 'success': False,
-                'error': str(e)
+                'error': 'A non-empty list of URLs is required'
             }), 400
-            
-        except Exception as e:
-            logger.error(f"Download failed: {str(e)}")
+        
+        if len(urls) > CONFIG['MAX_BATCH_SIZE']:
+            return jsonify({
+                'success': False,
+                'error': f"At most {CONFIG['MAX_BATCH_SIZE']} URLs per request"
+            }), 400
+        
+        # Validate every URL before queueing anything. Rejected entries are
+        # reported by position, never echoed back to the client.
+        valid, invalid = [], []
+        for index, url in enumerate(urls):
+            url = url.strip() if isinstance(url, str) else url
+            if is_valid_youtube_url(url):
+                valid.append(url)
+            else:
+                invalid.append(index)
+        
+        if not valid:
             return jsonify({
                 'success': False,
-                'error': f'Download failed: {str(e)}'
-            }), 500
+                'error': 'Invalid YouTube URL',
+                'invalid_indices': invalid,
+            }), 400
+        
+        logger.info(f"Processing batch download request for {len(valid)} URLs")
+        
+        jobs = []
+        for url in valid:
+            job_id, status = _enqueue_download(url)
+            jobs.append({
+                'url': url,
+                'job_id': job_id,
+                'status': status,
+                'status_url': url_for('job_status', job_id=job_id),
+                'progress_url': url_for('job_progress', job_id=job_id),
+            })
+        
+        return jsonify({
+            'success': True,
+            'message': 'Downloads queued',
+            'jobs': jobs,
+            'invalid_indices': invalid,
+        }), 202
     
     except Exception as e:
         logger.error(f"Request processing failed: {str(e)}")
@@ -247,20 +606,150 @@ def download_youtube_video():
             'error': 'Internal server error'
         }), 500
 
+def _job_response(job_id, job):
+    """Build the client-facing view of a job record."""
+    response_data = {
+        'success': job['status'] != 'failed',
+        'job_id': job_id,
+        'status': job['status'],
+    }
+    
+    if job['video_info']:
+        response_data['video_info'] = job['video_info']
+    
+    if job['status'] == 'started' and job['progress']:
+        response_data['progress'] = job['progress']
+    elif job['status'] == 'finished':
+        filename = job['result']['filename']
+        response_data.update({
+            'message': 'Video downloaded successfully',
+            'filename': filename,
+            'size': job['result']['size'],
+            'download_url': url_for('serve_file', filename=filename),
+        })
+    elif job['status'] == 'failed':
+        response_data['error'] = job['error']
+    
+    return response_data
+
+@app.route('/status/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report the state of a queued download."""
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+        job = dict(job) if job else None
+    
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify(_job_response(job_id, job))
+
+@app.route('/progress/<job_id>', methods=['GET'])
+def job_progress(job_id):
+    """Stream a job's status and download progress as Server-Sent Events."""
+    with _JOBS_LOCK:
+        if job_id not in _JOBS:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
+    
+    if not _PROGRESS_STREAMS.acquire(blocking=False):
+        return jsonify({
+            'success': False,
+            'error': 'Too many progress streams, poll the status URL instead',
+            'status_url': url_for('job_status', job_id=job_id),
+        }), 503, {'Retry-After': str(CONFIG['SSE_KEEPALIVE'])}
+    
+    def events():
+        last_seen = None
+        while True:
+            with _JOBS_CHANGED:
+                _JOBS_CHANGED.wait_for(
+                    lambda: _JOBS.get(job_id) != last_seen,
+                    timeout=CONFIG['SSE_KEEPALIVE'],
+                )
+                job = _JOBS.get(job_id)
+                job = dict(job) if job else None
+            
+            if job is None:  # Reaped while streaming
+                return
+            
+            if job == last_seen:
+                yield ': keep-alive\n\n'
+                continue
+            
+            last_seen = job
+            yield f'data: {app.json.dumps(_job_response(job_id, job))}\n\n'
+            
+            if job['status'] in ('finished', 'failed'):
+                return
+    
+    try:
+        response = Response(
+            stream_with_context(events()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',  # Don't let nginx buffer the stream
+            },
+        )
+    except Exception:
+        _PROGRESS_STREAMS.release()
+        raise
+    
+    # The WSGI server closes the response when the stream ends or the client leaves
+    response.call_on_close(_PROGRESS_STREAMS.release)
+    return response
+
+def _large_file_wrapper(file, buffer_size=8192):
+    """Fallback ``wsgi.file_wrapper`` that reads SEND_FILE_BUFFER_SIZE bytes per chunk."""
+    return FileWrapper(file, max(buffer_size, CONFIG['SEND_FILE_BUFFER_SIZE']))
+
 @app.route('/files/<filename>', methods=['GET'])
 def serve_file(filename):
     """Serve downloaded files (optional endpoint for file delivery)."""
     try:
-        file_path = os.path.join(CONFIG['DOWNLOAD_DIR'], filename)
-        
-        if not os.path.exists(file_path):
-            return jsonify({'error': 'File not found'}), 404
+        # Security check - plain file names only, rejected without any syscalls
+        if os.sep in filename or (os.altsep and os.altsep in filename) or filename in ('.', '..'):
+            return jsonify({'error': 'Access denied'}), 403
         
-        # Security check - ensure file is in download directory
-        if not os.path.abspath(file_path).startswith(os.path.abspath(CONFIG['DOWNLOAD_DIR'])):
+        # Ensure the resolved file (following symlinks) is in the download directory
+        file_path = os.path.realpath(os.path.join(_ABS_DOWNLOAD_DIR, filename))
+        if os.path.commonpath([file_path, _ABS_DOWNLOAD_DIR]) != _ABS_DOWNLOAD_DIR:
             return jsonify({'error': 'Access denied'}), 403
         
-        return send_file(file_path, as_attachment=True)
+        if CONFIG['USE_XACCEL']:
+            if not os.path.exists(file_path):
+                return jsonify({'error': 'File not found'}), 404
+            
+            # nginx serves the file from its internal location with sendfile(),
+            # so no bytes pass through this worker
+            response = make_response('')
+            response.headers['X-Accel-Redirect'] = CONFIG['XACCEL_PREFIX'] + quote(filename)
+            response.headers.set('Content-Disposition', 'attachment', filename=filename)
+            response.headers['Content-Type'] = 'application/octet-stream'
+            return response
+        
+        # Servers that provide their own file wrapper (e.g. gunicorn's sendfile)
+        # keep it; otherwise stream in large chunks instead of Werkzeug's 8 KiB
+        request.environ.setdefault('wsgi.file_wrapper', _large_file_wrapper)
+        
+        # send_file opens the file, so the reaper cannot delete it in between
+        with _FILES_LOCK:
+            if not os.path.exists(file_path):
+                return jsonify({'error': 'File not found'}), 404
+            
+            return send_file(
+                file_path,
+                as_attachment=True,
+                conditional=True,  # Range and If-Modified-Since support for seeking
+                download_name=filename,
+                max_age=0,
+            )
         
     except Exception as e:
         logger.error(f"File serving error: {str(e)}")
@@ -275,7 +764,8 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    # Development server
+    # Development server only. In production run gunicorn from this directory,
+    # which picks up gunicorn.conf.py:  gunicorn app:app
     app.run(
         host='0.0.0.0',
         port=5000,
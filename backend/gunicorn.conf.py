@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration for the YouTube Downloader backend.
+
+Run from the backend directory with: gunicorn app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers: requests are short (downloads run on the background
+# executor), but file transfers and polling clients hold connections open.
+# Every open /progress stream (SSE) occupies a thread for the whole download,
+# so size threads for MAX_PROGRESS_STREAMS (default 16) plus regular traffic;
+# streams beyond that limit get a 503 and clients fall back to polling.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+
+# Download jobs and the in-flight map live in process memory, so /status has
+# to reach the worker that accepted the job. Scale with threads; only raise
+# this if requests are pinned to a worker (e.g. sticky sessions).
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Reuse client connections between status polls
+keepalive = 30
+timeout = 120
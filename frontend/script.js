@@ -1,10 +1,6 @@
-// YouTube URL validation regex patterns
-const YOUTUBE_REGEX = [
-    /^https?:\/\/(www\.)?(youtube\.com\/watch\?v=|youtu\.be\/)([a-zA-Z0-9_-]{11})/,
-    /^https?:\/\/(www\.)?youtube\.com\/embed\/([a-zA-Z0-9_-]{11})/,
-    /^https?:\/\/(www\.)?youtube\.com\/v\/([a-zA-Z0-9_-]{11})/,
-    /^https?:\/\/(www\.)?youtube\.com\/playlist\?list=([a-zA-Z0-9_-]+)/
-];
+// YouTube URL validation regex (same as backend)
+const YOUTUBE_REGEX = /^https?:\/\/(?:www\.)?(?:youtube\.com\/(?:watch\?v=|embed\/|v\/)([A-Za-z0-9_-]{11})(?:[?&#/]|$)|youtu\.be\/([A-Za-z0-9_-]{11})(?:[?&#/]|$)|youtube\.com\/playlist\?list=([A-Za-z0-9_-]+))/;
+const MAX_URL_LENGTH = 2048;
 
 // DOM elements
 const form = document.getElementById('downloadForm');
@@ -17,6 +13,7 @@ const downloadLinkDiv = document.getElementById('downloadLink');
 // Backend API endpoint (adjust based on your Flask server setup)
 const API_BASE_URL = window.location.origin;
 const DOWNLOAD_ENDPOINT = `${API_BASE_URL}/download`;
+const STATUS_POLL_INTERVAL = 2000;  // ms between /status polls
 
 /**
  * Validate YouTube URL using regex patterns
@@ -28,7 +25,11 @@ function isValidYouTubeUrl(url) {
         return false;
     }
     
-    return YOUTUBE_REGEX.some(regex => regex.test(url.trim()));
+    if (url.length > MAX_URL_LENGTH) {
+        return false;
+    }
+    
+    return YOUTUBE_REGEX.test(url.trim());
 }
 
 /**
@@ -107,6 +108,84 @@ function setLoadingState(isLoading) {
     }
 }
 
+/**
+ * Describe a running job's progress for the status message
+ * @param {Object} job - Job status from /status or /progress
+ * @returns {string} - Human readable status
+ */
+function describeJob(job) {
+    if (job.status === 'queued') {
+        return 'Waiting in queue...';
+    }
+
+    const progress = job.progress;
+    if (progress && progress.total_bytes) {
+        const percent = Math.floor(100 * progress.downloaded_bytes / progress.total_bytes);
+        const eta = progress.eta ? ` (${progress.eta}s left)` : '';
+        return `Downloading video... ${percent}%${eta}`;
+    }
+
+    return 'Downloading video...';
+}
+
+/**
+ * Poll a queued download job until it finishes or fails
+ * @param {string} statusUrl - Job status URL returned by /download
+ * @returns {Promise<Object>} - Final job status
+ */
+async function pollJob(statusUrl) {
+    while (true) {
+        const response = await fetch(`${API_BASE_URL}${statusUrl}`);
+        const data = await response.json();
+
+        if (!response.ok || data.status === 'failed') {
+            throw new Error(data.error || `HTTP error! status: ${response.status}`);
+        }
+
+        if (data.status === 'finished') {
+            return data;
+        }
+
+        showStatus(describeJob(data), 'loading');
+        await new Promise(resolve => setTimeout(resolve, STATUS_POLL_INTERVAL));
+    }
+}
+
+/**
+ * Follow a download job through its Server-Sent Events progress stream
+ * @param {Object} job - Response from /download
+ * @returns {Promise<Object>} - Final job status
+ */
+function waitForJob(job) {
+    if (!window.EventSource || !job.progress_url) {
+        return pollJob(job.status_url);
+    }
+
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`${API_BASE_URL}${job.progress_url}`);
+
+        source.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+
+            if (data.status === 'finished') {
+                source.close();
+                resolve(data);
+            } else if (data.status === 'failed') {
+                source.close();
+                reject(new Error(data.error || 'Download failed'));
+            } else {
+                showStatus(describeJob(data), 'loading');
+            }
+        };
+
+        // Fall back to polling if the stream drops
+        source.onerror = () => {
+            source.close();
+            pollJob(job.status_url).then(resolve, reject);
+        };
+    });
+}
+
 /**
  * Send download request to Flask backend
  * @param {string} url - YouTube URL to download
@@ -129,17 +208,19 @@ async function sendDownloadRequest(url) {
             throw new Error(data.error || `HTTP error! status: ${response.status}`);
         }
 
-        if (data.success) {
-            showStatus('Download completed successfully!', 'success');
-            
-            // Show download link if provided
-            if (data.download_url && data.filename) {
-                showDownloadLink(data.download_url, data.filename);
-            }
-        } else {
+        if (!data.success) {
             throw new Error(data.error || 'Download failed');
         }
 
+        // The download runs in the background; wait for it to complete
+        const result = await waitForJob(data);
+        showStatus('Download completed successfully!', 'success');
+        
+        // Show download link if provided
+        if (result.download_url && result.filename) {
+            showDownloadLink(`${API_BASE_URL}${result.download_url}`, result.filename);
+        }
+
     } catch (error) {
         console.error('Download error:', error);
         showStatus(`Error: ${error.message}`, 'error');